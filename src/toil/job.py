@@ -1541,8 +1541,11 @@ class Job:
             # Merge into the other component instead
             other._jobGraphsJoined(self)
         else:
-            if self._registry != other._registry:
-                # We are in fact joining connected components.
+            if self._registry is not other._registry:
+                # We are in fact joining connected components. Connected
+                # components share their registry dict as one object, so
+                # identity is the right test; comparing by value would walk
+                # every entry on every edge added within a component.
 
                 # Steal everything from the other connected component's registry
                 self._registry.update(other._registry)
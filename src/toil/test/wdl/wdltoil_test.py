@@ -41,6 +41,26 @@ class WdlToilTest(toil.test.wdl.toilwdlTest.ToilWdlTest):
         assert os.path.exists(result['ga4ghMd5.value'])
         assert os.path.basename(result['ga4ghMd5.value']) == 'md5sum.txt'
 
+    def test_scatter_of_decls(self):
+        """
+        Test if a scatter over more items than fit in one scatter chunk, with
+        a declaration chain and a conditional in its body, produces complete
+        and ordered gathered arrays. Needs no containers.
+        """
+        wdl = os.path.abspath('src/toil/test/wdl/decl_scatter/decl_scatter.wdl')
+
+        result_json = subprocess.check_output(self.base_command + [wdl, '-o', self.output_dir])
+        result = json.loads(result_json)
+
+        # The workflow scatters over range(100), well past the per-chunk item
+        # limit, so the arrays cross chunk boundaries and must come back
+        # complete and in item order.
+        assert result['decl_scatter.doubled_items'] == [i * 2 for i in range(100)]
+        assert result['decl_scatter.descriptions'] == [f'item {i * 2 + 1}' for i in range(100)]
+        # The conditional only binds a value for even items, so the gathered
+        # array should have nulls aligned at the odd indices.
+        assert result['decl_scatter.halved_items'] == [i if i % 2 == 0 else None for i in range(100)]
+
     @needs_singularity
     def test_miniwdl_self_test(self):
         """Test if the MiniWDL self test runs and produces the expected output."""
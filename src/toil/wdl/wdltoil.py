@@ -15,8 +15,8 @@
 import argparse
 import asyncio
 import collections
-import copy
 import errno
+import functools
 import glob
 import io
 import itertools
@@ -32,7 +32,7 @@ import tempfile
 import uuid
 
 from contextlib import ExitStack
-from typing import cast, Any, Callable, Union, Dict, List, Optional, Set, Sequence, Tuple, Type, TypeVar, Iterator
+from typing import cast, Any, Callable, Collection, NamedTuple, Union, Dict, List, Optional, Set, Sequence, Tuple, Type, TypeVar, Iterator
 from urllib.parse import urlsplit, urljoin, quote, unquote
 
 import WDL
@@ -41,6 +41,14 @@ from WDL.runtime.backend.singularity import SingularityContainer
 from WDL.runtime.backend.docker_swarm import SwarmContainer
 import WDL.runtime.config
 
+try:
+    # orjson parses big input JSON documents several times faster than the
+    # stdlib json module. It isn't one of our dependencies, so only use it if
+    # it happens to be installed.
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 from toil.common import Config, Toil, addOptions
 from toil.job import AcceleratorRequirement, Job, JobFunctionWrappingJob, Promise, Promised, accelerators_fully_satisfy, parse_accelerator, unwrap, unwrap_all
 from toil.fileStores import FileID
@@ -101,6 +109,8 @@ def potential_absolute_uris(uri: str, path: List[str], importer: Optional[WDL.Tr
     # This holds all the URIs we tried and failed with.
     failures: Set[str] = set()
 
+    debug_logging = logger.isEnabledFor(logging.DEBUG)
+
     for candidate_base in full_path_list:
         # Try fetching based off each base URI
         candidate_uri = urljoin(candidate_base, uri)
@@ -108,7 +118,8 @@ def potential_absolute_uris(uri: str, path: List[str], importer: Optional[WDL.Tr
         if candidate_uri in failures:
             # Already tried this one, maybe we have an absolute uri input.
             continue
-        logger.debug('Consider %s which is %s off of %s', candidate_uri, uri, candidate_base)
+        if debug_logging:
+            logger.debug('Consider %s which is %s off of %s', candidate_uri, uri, candidate_base)
 
         # Try it
         yield candidate_uri
@@ -126,10 +137,13 @@ async def toil_read_source(uri: str, path: List[str], importer: Optional[WDL.Tre
     # We track our own failures for debugging
     tried = []
 
+    debug_logging = logger.isEnabledFor(logging.DEBUG)
+
     for candidate_uri in potential_absolute_uris(uri, path, importer):
         # For each place to try in order
         destination_buffer = io.BytesIO()
-        logger.debug('Fetching %s', candidate_uri)
+        if debug_logging:
+            logger.debug('Fetching %s', candidate_uri)
         tried.append(candidate_uri)
         try:
             # TODO: this is probably sync work that would be better as async work here
@@ -138,7 +152,8 @@ async def toil_read_source(uri: str, path: List[str], importer: Optional[WDL.Tre
             # TODO: we need to assume any error is just a not-found,
             # because the exceptions thrown by read_from_url()
             # implementations are not specified.
-            logger.debug('Tried to fetch %s from %s but got %s', uri, candidate_uri, e)
+            if debug_logging:
+                logger.debug('Tried to fetch %s from %s but got %s', uri, candidate_uri, e)
             continue
         # If we get here, we got it probably.
         try:
@@ -185,26 +200,46 @@ def combine_bindings(all_bindings: Sequence[WDLBindings]) -> WDLBindings:
     if len(all_bindings) == 0:
         # Combine nothing
         return WDL.Env.Bindings()
-    else:
-        # Sort, largest first
-        all_bindings = sorted(all_bindings, key=lambda x: -len(x))
-
-        merged = all_bindings[0]
-        for bindings in all_bindings[1:]:
-            for binding in bindings:
-                if binding.name in merged:
-                    # This is a duplicate
-                    existing_value = merged[binding.name]
-                    if existing_value != binding.value:
-                        raise RuntimeError('Conflicting bindings for %s with values %s and %s', binding.name, existing_value, binding.value)
-                    else:
-                        logger.debug('Drop duplicate binding for %s', binding.name)
-                else:
-                    merged = merged.bind(binding.name, binding.value, binding.info)
+
+    if len(all_bindings) == 1:
+        # Combining a single set of bindings is the identity. Upstream jobs
+        # routinely hand us results that are themselves already combined, so
+        # don't walk them again.
+        return all_bindings[0]
+
+    # len() on a Bindings walks its whole resolution chain, so sorting by
+    # length re-walks every chain for every comparison. Instead, count each
+    # set of bindings exactly once and start the merge from the largest one;
+    # the others can stay in whatever order they arrived, since the merge
+    # result doesn't depend on it.
+    sizes = [sum(1 for _ in bindings) for bindings in all_bindings]
+    largest = sizes.index(max(sizes))
+
+    debug_logging = logger.isEnabledFor(logging.DEBUG)
+
+    merged = all_bindings[largest]
+    for which, bindings in enumerate(all_bindings):
+        if which == largest:
+            # Already the base of the merge
+            continue
+        for binding in bindings:
+            if binding.name in merged:
+                # This is a duplicate
+                existing_value = merged[binding.name]
+                if existing_value != binding.value:
+                    raise RuntimeError('Conflicting bindings for %s with values %s and %s', binding.name, existing_value, binding.value)
+                elif debug_logging:
+                    logger.debug('Drop duplicate binding for %s', binding.name)
+            else:
+                merged = merged.bind(binding.name, binding.value, binding.info)
 
     return merged
 
 # TODO: Develop a Protocol that can match the logging function type more closely
+# What logging level does each logger method correspond to? Used to skip
+# formatting bindings that nobody will see.
+_LOG_FUNCTION_LEVELS = {'debug': logging.DEBUG, 'info': logging.INFO, 'warning': logging.WARNING, 'error': logging.ERROR, 'exception': logging.ERROR}
+
 def log_bindings(log_function: Callable[..., None], message: str, all_bindings: Sequence[Promised[WDLBindings]]) -> None:
     """
     Log bindings to the console, even if some are still promises.
@@ -213,11 +248,19 @@ def log_bindings(log_function: Callable[..., None], message: str, all_bindings:
     :param message: Message to log before the bindings
     :param all_bindings: A list of bindings or promises for bindings, to log
     """
+    # Walking and stringifying every binding is real work, so don't do it if
+    # the destination logger would drop the messages anyway.
+    destination = getattr(log_function, '__self__', None)
+    level = _LOG_FUNCTION_LEVELS.get(getattr(log_function, '__name__', ''))
+    if isinstance(destination, logging.Logger) and level is not None and not destination.isEnabledFor(level):
+        return
+
     log_function(message)
     for bindings in all_bindings:
         if isinstance(bindings, WDL.Env.Bindings):
-            for binding in bindings:
-                log_function("%s = %s", binding.name, binding.value)
+            # Join each set of bindings into one message so the logging
+            # subsystem dispatches once per set instead of once per binding.
+            log_function("%s", ", ".join(f"{binding.name} = {binding.value}" for binding in bindings))
         elif isinstance(bindings, Promise):
             log_function("<Unfulfilled promise for bindings>")
 
@@ -258,12 +301,24 @@ def for_each_node(root: WDL.Tree.WorkflowNode) -> Iterator[WDL.Tree.WorkflowNode
     internal nodes of conditionals and scatters, and gather nodes.
     """
 
-    logger.debug('WorkflowNode: %s: %s %s', type(root), root, root.workflow_node_id)
-    yield root
-    for child_node in root.children:
-        if isinstance(child_node, WDL.Tree.WorkflowNode):
-            for result in for_each_node(child_node):
-                yield result
+    # Walk the tree with an explicit stack rather than recursive generators,
+    # which would create a generator per level and pass every yielded node
+    # back up through all of them.
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('WorkflowNode: %s: %s %s', type(node), node, node.workflow_node_id)
+        yield node
+        # Visit children in their original order despite the stack's reversal.
+        children = [child_node for child_node in node.children if isinstance(child_node, WDL.Tree.WorkflowNode)]
+        stack.extend(reversed(children))
+
+# The dependencies of a node are fixed once the document is loaded, and
+# nested sections make the same subtrees get walked when planning both their
+# own section and every enclosing one. Memoize by node identity; the cache
+# keeps a reference to the node so its id stays valid.
+_recursive_dependencies_cache: Dict[int, Tuple[WDL.Tree.WorkflowNode, Set[str]]] = {}
 
 def recursive_dependencies(root: WDL.Tree.WorkflowNode) -> Set[str]:
     """
@@ -274,6 +329,10 @@ def recursive_dependencies(root: WDL.Tree.WorkflowNode) -> Set[str]:
     reflected in those of the section node itself.
     """
 
+    cached = _recursive_dependencies_cache.get(id(root))
+    if cached is not None and cached[0] is root:
+        return cached[1]
+
     # What are all dependencies?
     needed: Set[str] = set()
     # And what dependencies are provided internally?
@@ -286,7 +345,159 @@ def recursive_dependencies(root: WDL.Tree.WorkflowNode) -> Set[str]:
         provided.add(node.workflow_node_id)
 
     # And produce the diff
-    return needed - provided
+    result = needed - provided
+    _recursive_dependencies_cache[id(root)] = (root, result)
+    return result
+
+class WDLSectionGraph(NamedTuple):
+    """
+    Pre-solved dependency structure for the nodes in a workflow section.
+
+    Everything in here is computed only from the WDL document, so one graph
+    can be shared between all the instantiations of a section (such as the
+    iterations of a scatter) instead of being re-derived for each one.
+    """
+
+    # What nodes exist, under their IDs?
+    wdl_id_to_wdl_node: Dict[str, WDL.Tree.WorkflowNode]
+    # What are the dependencies of each body node on other body nodes?
+    wdl_id_to_dependency_ids: Dict[str, Tuple[str, ...]]
+    # What nodes depend on each node?
+    wdl_id_to_dependent_ids: Dict[str, List[str]]
+    # Which nodes have no dependencies within the section, and so are ready
+    # as soon as the section starts?
+    root_node_ids: List[str]
+    # Maximal chains of value declarations that run as single units, from
+    # chain head ID to the ordered member IDs. Members other than the head
+    # are dropped from the dependency maps; the chain depends on what its
+    # head depends on and is depended on via its tail.
+    wdl_id_to_chain: Dict[str, List[str]]
+
+# Section graphs are cached under the IDs of the nodes they cover. Node IDs
+# are unique within a document but not necessarily across documents, so we
+# also remember the nodes each graph was built from and check them on lookup.
+_section_graph_cache: Dict[Tuple[str, ...], Tuple[Tuple[WDL.Tree.WorkflowNode, ...], WDLSectionGraph]] = {}
+
+def plan_section_graph(nodes: Sequence[WDL.Tree.WorkflowNode]) -> WDLSectionGraph:
+    """
+    Solve the dependency DAG for the given section body nodes.
+
+    Results are cached per process, so a scatter body's graph is solved once
+    and not once per scatter item.
+    """
+
+    cache_key = tuple(node.workflow_node_id for node in nodes if isinstance(node, WDL.Tree.WorkflowNode))
+    cached = _section_graph_cache.get(cache_key)
+    if cached is not None and all(cached_node is node for cached_node, node in zip(cached[0], nodes)):
+        return cached[1]
+
+    # We need to track the dependency universe; some child nodes may depend on
+    # nodes that are e.g. inputs to the workflow that encloses the section
+    # that encloses this section, and we need to just assume those are already
+    # available, even though we don't have access to the complete list. So we
+    # make a set of everything we actually do need to care about resolving,
+    # instead.
+    dependabes: Set[str] = set()
+
+    # What nodes exist, under their IDs?
+    wdl_id_to_wdl_node: Dict[str, WDL.Tree.WorkflowNode] = {node.workflow_node_id: node for node in nodes if isinstance(node, WDL.Tree.WorkflowNode)}
+    dependabes |= set(wdl_id_to_wdl_node.keys())
+
+    # That doesn't include gather nodes, which in the Toil interpreter we
+    # handle as part of their enclosing section, without individual Toil
+    # jobs for each. So make a map from gather ID to the section node ID.
+    gather_to_section: Dict[str, str] = {}
+    for node in nodes:
+        if isinstance(node, WDL.Tree.WorkflowSection):
+            for gather_node in node.gathers.values():
+                gather_to_section[gather_node.workflow_node_id] = node.workflow_node_id
+    dependabes |= set(gather_to_section.keys())
+
+    # We also need to make sure to bubble up dependencies from inside
+    # sections. A conditional might only appear to depend on the variables
+    # in the conditional expression, but its body can depend on other
+    # stuff, and we need to make sure that that stuff has finished and
+    # updated the environment before the conditional body runs. TODO: This
+    # is because Toil can't go and get and add successors to the relevant
+    # jobs later, while MiniWDL's engine apparently can. This ends up
+    # reducing parallelism more than would strictly be necessary; nothing
+    # in the conditional can start until the dependencies of everything in
+    # the conditional are ready.
+
+    # What are the dependencies of all the body nodes on other body nodes?
+    # Nodes can depend on other nodes actually in the tree, or on gathers
+    # that belong to other nodes, but we rewrite the gather dependencies
+    # through to the enclosing section node. Skip any dependencies on
+    # anything not provided by another body node (such as on an input, or
+    # something outside of the current section). TODO: This will need to
+    # change if we let parallelism transcend sections.
+    #
+    # Collect the dependency map, the inverted dependent map, and the roots
+    # in one pass over the nodes rather than re-iterating per structure.
+    wdl_id_to_dependency_ids: Dict[str, Tuple[str, ...]] = {}
+    # Each edge is recorded exactly once, so the inverted map can hold plain
+    # lists: no hashing on insert, and less memory than a set per node.
+    wdl_id_to_dependent_ids: Dict[str, List[str]] = {node_id: [] for node_id in wdl_id_to_wdl_node}
+    root_node_ids: List[str] = []
+    for node_id, node in wdl_id_to_wdl_node.items():
+        dependencies = {gather_to_section[dep] if dep in gather_to_section else dep for dep in recursive_dependencies(node) if dep in dependabes}
+        # Freeze each dependency collection as a sorted tuple: iteration is
+        # faster and, unlike set order, deterministic across runs, so the
+        # edge wiring below doesn't churn between otherwise-identical
+        # invocations.
+        wdl_id_to_dependency_ids[node_id] = tuple(sorted(dependencies))
+        for dependency_id in dependencies:
+            # Invert the dependency edges
+            wdl_id_to_dependent_ids[dependency_id].append(node_id)
+        if not dependencies:
+            # Nothing in the section has to run first
+            root_node_ids.append(node_id)
+
+    # Collapse maximal chains of plain value declarations, where each link is
+    # the only thing waiting on its predecessor, into single scheduling
+    # units. Such a chain holds no parallelism, so making a Toil job per decl
+    # only buys serialization and scheduling round-trips. Only decls are safe
+    # to evaluate back-to-back in one job; calls and sections schedule
+    # subjobs of their own.
+    wdl_id_to_chain: Dict[str, List[str]] = {}
+    chained_away: Set[str] = set()
+    for node_id, node in wdl_id_to_wdl_node.items():
+        if node_id in chained_away or not isinstance(node, WDL.Tree.Decl):
+            continue
+        chain_dependencies = wdl_id_to_dependency_ids[node_id]
+        if len(chain_dependencies) == 1:
+            predecessor = wdl_id_to_wdl_node.get(chain_dependencies[0])
+            if isinstance(predecessor, WDL.Tree.Decl) and wdl_id_to_dependent_ids[chain_dependencies[0]] == [node_id]:
+                # This node extends a chain that starts further up; we will
+                # collect it when we walk from that chain's head.
+                continue
+        # This node heads a (possibly one-entry) chain. Follow it down.
+        chain = [node_id]
+        while True:
+            tail_dependents = wdl_id_to_dependent_ids[chain[-1]]
+            if len(tail_dependents) != 1:
+                break
+            next_id = tail_dependents[0]
+            next_node = wdl_id_to_wdl_node.get(next_id)
+            next_dependencies = wdl_id_to_dependency_ids[next_id] if next_id in wdl_id_to_dependency_ids else None
+            if not isinstance(next_node, WDL.Tree.Decl) or next_dependencies != (chain[-1],):
+                break
+            chain.append(next_id)
+        if len(chain) > 1:
+            wdl_id_to_chain[node_id] = chain
+            chained_away.update(chain[1:])
+
+    for head_id, chain in wdl_id_to_chain.items():
+        # Rewrite the maps so the chain appears as one node: dependents come
+        # from the tail, and the interior members disappear.
+        wdl_id_to_dependent_ids[head_id] = wdl_id_to_dependent_ids.pop(chain[-1])
+        for member_id in chain[1:]:
+            del wdl_id_to_dependency_ids[member_id]
+            wdl_id_to_dependent_ids.pop(member_id, None)
+
+    graph = WDLSectionGraph(wdl_id_to_wdl_node, wdl_id_to_dependency_ids, wdl_id_to_dependent_ids, root_node_ids, wdl_id_to_chain)
+    _section_graph_cache[cache_key] = (tuple(nodes), graph)
+    return graph
 
 # We define a URI scheme kind of like but not actually compatible with the one
 # we use for CWL. CWL brings along the file basename in its file type, but
@@ -348,6 +559,21 @@ class ToilWDLStdLibBase(WDL.StdLib.Base):
         # Keep the file store around so we can access files.
         self._file_store = file_store
 
+        # Within one standard library the same File is routinely accessed
+        # several times (read_lines and then size, say), and re-staging it
+        # from the job store each time is real work. Remember the mapping in
+        # both directions so repeated devirtualizations hit the local copy
+        # and re-virtualizing a file we already know about doesn't upload it
+        # again.
+        self._virtualized_to_devirtualized: Dict[str, str] = {}
+        self._devirtualized_to_virtualized: Dict[str, str] = {}
+
+        # Values of side-effect-free expressions, keyed on the expression's ID
+        # and the identities of the bindings it was evaluated against. Each
+        # entry keeps references to the values behind those identities, so a
+        # key can only match while the exact objects it describes are alive.
+        self._eval_cache: Dict[Tuple[int, Tuple[Tuple[str, int], ...]], Tuple[List[WDL.Value.Base], WDL.Value.Base]] = {}
+
     # Both the WDL code itself **and** the commands that it runs will deal in
     # "virtualized" filenames by default, so when making commands we need to
     # make sure to devirtualize filenames.
@@ -355,14 +581,18 @@ class ToilWDLStdLibBase(WDL.StdLib.Base):
     # Command Section, the fully qualified, localized path to the file is
     # substituted when that declaration is referenced in the command template."
 
-    def _is_url(self, filename: str, schemes: List[str] = ['http:', 'https:', 's3:', 'gs:', TOIL_URI_SCHEME]) -> bool:
+    # All the URL schemes we think Toil can read, precomputed so that
+    # deciding whether a filename is a URL is one partition and one set
+    # lookup instead of a startswith call per scheme.
+    _READABLE_SCHEMES = frozenset(['http:', 'https:', 's3:', 'gs:', TOIL_URI_SCHEME])
+
+    def _is_url(self, filename: str, schemes: Optional[Collection[str]] = None) -> bool:
         """
         Decide if a filename is a known kind of URL
         """
-        for scheme in schemes:
-            if filename.startswith(scheme):
-                return True
-        return False
+        if schemes is None:
+            schemes = self._READABLE_SCHEMES
+        return filename.partition(':')[0] + ':' in schemes
 
     def _devirtualize_filename(self, filename: str) -> str:
         """
@@ -373,7 +603,15 @@ class ToilWDLStdLibBase(WDL.StdLib.Base):
         # TODO: Support people doing path operations (join, split, get parent directory) on the virtualized filenames.
         # TODO: For task inputs, we are supposed to make sure to put things in the same directory if they came from the same directory. See <https://github.com/openwdl/wdl/blob/main/versions/1.0/SPEC.md#task-input-localization>
 
-        if filename.startswith(TOIL_URI_SCHEME):
+        cached = self._virtualized_to_devirtualized.get(filename)
+        if cached is not None:
+            # We already have a local copy of this file
+            return cached
+
+        # Split out the scheme once and dispatch on it, instead of testing
+        # prefixes one at a time.
+        scheme = filename.partition(':')[0] + ':'
+        if scheme == TOIL_URI_SCHEME:
             # This is a reference to the Toil filestore.
             # Deserialize the FileID
             file_id, file_basename = unpack_toil_uri(filename)
@@ -384,7 +622,7 @@ class ToilWDLStdLibBase(WDL.StdLib.Base):
 
             # And get a local path to the file
             result = self._file_store.readGlobalFile(file_id, dest_path)
-        elif self._is_url(filename):
+        elif scheme in self._READABLE_SCHEMES:
             # This is some other URL that we think Toil knows how to read.
             # Import into the job store from here and then download to the node.
             # TODO: Can we predict all the URLs that can be used up front and do them all on the leader, where imports are meant to happen?
@@ -399,6 +637,11 @@ class ToilWDLStdLibBase(WDL.StdLib.Base):
 
         logger.debug('Devirtualized %s as openable file %s', filename, result)
         assert os.path.exists(result), f"Virtualized file {filename} looks like a local file but isn't!"
+        self._virtualized_to_devirtualized[filename] = result
+        if result != filename:
+            # Re-virtualizing the local copy should give back the virtual
+            # name we already have, not upload the file again.
+            self._devirtualized_to_virtualized[result] = filename
         return result
 
     def _virtualize_filename(self, filename: str) -> str:
@@ -413,12 +656,39 @@ class ToilWDLStdLibBase(WDL.StdLib.Base):
             logger.debug('Virtualized %s as WDL file %s', filename, filename)
             return filename
 
+        cached = self._devirtualized_to_virtualized.get(filename)
+        if cached is not None:
+            # We already virtualized this file
+            return cached
+
         # Otherwise this is a local file and we want to fake it as a Toil file store file
         file_id = self._file_store.writeGlobalFile(filename)
         result = pack_toil_uri(file_id, os.path.basename(filename))
         logger.debug('Virtualized %s as WDL file %s', filename, result)
+        self._devirtualized_to_virtualized[filename] = result
+        self._virtualized_to_devirtualized[result] = filename
         return result
 
+# Setting up the standard library registers every stdlib function with
+# miniwdl, which is pure Python setup work there is no reason to repeat for
+# every job that runs in a worker process. The library's behavior depends
+# only on the file store, so remember the most recently built instance and
+# hand it back to every job sharing that file store.
+_last_standard_library: Optional[Tuple[AbstractFileStore, ToilWDLStdLibBase]] = None
+
+def get_standard_library(file_store: AbstractFileStore) -> ToilWDLStdLibBase:
+    """
+    Get a ToilWDLStdLibBase against the given file store, sharing one
+    instance between jobs that see the same file store.
+    """
+
+    global _last_standard_library
+    if _last_standard_library is not None and _last_standard_library[0] is file_store:
+        return _last_standard_library[1]
+    standard_library = ToilWDLStdLibBase(file_store)
+    _last_standard_library = (file_store, standard_library)
+    return standard_library
+
 class ToilWDLStdLibTaskOutputs(ToilWDLStdLibBase, WDL.StdLib.TaskOutputs):
     """
     Standard library implementation for WDL as run on Toil, with additional
@@ -550,6 +820,86 @@ class ToilWDLStdLibTaskOutputs(ToilWDLStdLibBase, WDL.StdLib.TaskOutputs):
 
         return super()._virtualize_filename(filename)
 
+# Expressions and their types are immutable once the WDL document is loaded,
+# so typechecking an expression against an expected type only ever needs to
+# happen once per expression, not once per evaluation (which for a scatter
+# body means once per item). We key on the expression's ID, keeping a
+# reference to it so the ID stays valid, and on the expected type's string
+# form: callers routinely build the expected type fresh per call (such as a
+# new WDL.Type.Boolean() per conditional), so keying on the type object's ID
+# would never hit and would pin a new entry per evaluation.
+_typechecked_expressions: Dict[Tuple[int, str], WDL.Expr.Base] = {}
+
+# Standard library functions that an expression can't call if we want to cache
+# its value: they make files, or read files that the current task made.
+_IMPURE_FUNCTIONS = frozenset(['stdout', 'stderr', 'glob', 'write_lines', 'write_tsv', 'write_map', 'write_json', 'write_object', 'write_objects'])
+
+# Whether each expression (by ID) avoids all the impure functions, and so can
+# have its value cached. As with typechecking, we keep a reference to the
+# expression so its ID stays valid.
+_expression_cacheable: Dict[int, Tuple[WDL.Expr.Base, bool]] = {}
+
+def expression_is_cacheable(expression: WDL.Expr.Base) -> bool:
+    """
+    Decide if an expression's value is safe to cache: it must not call any
+    standard library function that creates or inspects files made by the
+    running task.
+    """
+
+    cached = _expression_cacheable.get(id(expression))
+    if cached is not None and cached[0] is expression:
+        return cached[1]
+
+    cacheable = True
+    stack: List[WDL.Error.SourceNode] = [expression]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, WDL.Expr.Apply) and node.function_name in _IMPURE_FUNCTIONS:
+            cacheable = False
+            break
+        stack.extend(node.children)
+
+    _expression_cacheable[id(expression)] = (expression, cacheable)
+    return cacheable
+
+# Standard library functions whose results depend on files, which we can't
+# assume are the same across jobs even for constant arguments.
+_FILE_READING_FUNCTIONS = frozenset(['read_lines', 'read_tsv', 'read_map', 'read_json', 'read_object', 'read_objects', 'read_string', 'read_int', 'read_float', 'read_boolean', 'size'])
+
+# Whether each expression (by ID) is a constant: it reads no variables and
+# calls nothing impure or file-dependent, so it evaluates to the same value in
+# any environment. Keeps a reference to the expression so the ID stays valid.
+_expression_constant: Dict[int, Tuple[WDL.Expr.Base, bool]] = {}
+
+# Values of constant expressions, evaluated once per process.
+_constant_expression_values: Dict[int, Tuple[WDL.Expr.Base, WDL.Value.Base]] = {}
+
+def expression_is_constant(expression: WDL.Expr.Base) -> bool:
+    """
+    Decide if an expression evaluates to the same value in any environment:
+    it must reference no variables and call no standard library function that
+    has side effects or reads files.
+    """
+
+    cached = _expression_constant.get(id(expression))
+    if cached is not None and cached[0] is expression:
+        return cached[1]
+
+    constant = True
+    stack: List[WDL.Error.SourceNode] = [expression]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, WDL.Expr.Ident):
+            constant = False
+            break
+        if isinstance(node, WDL.Expr.Apply) and (node.function_name in _IMPURE_FUNCTIONS or node.function_name in _FILE_READING_FUNCTIONS):
+            constant = False
+            break
+        stack.extend(node.children)
+
+    _expression_constant[id(expression)] = (expression, constant)
+    return constant
+
 def evaluate_named_expression(context: Union[WDL.Error.SourceNode, WDL.Error.SourcePosition], name: str, expected_type: Optional[WDL.Type.Base], expression: Optional[WDL.Expr.Base], environment: WDLBindings, stdlib: WDL.StdLib.Base) -> WDL.Value.Base:
     """
     Evaluate an expression when we know the name of it.
@@ -562,14 +912,41 @@ def evaluate_named_expression(context: Union[WDL.Error.SourceNode, WDL.Error.Sou
         else:
             raise WDL.Error.EvalError(context, "Cannot evaluate no expression for " + name)
     else:
-        logger.debug("Evaluate expression for %s: %s", name, expression)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Evaluate expression for %s: %s", name, expression)
         try:
             if expected_type:
-                # Make sure the types are allowed
-                expression.typecheck(expected_type)
-
-            # Do the actual evaluation
-            value = expression.eval(environment, stdlib)
+                # Make sure the types are allowed, walking the expression only
+                # the first time we see this expression/type combination.
+                check_key = (id(expression), str(expected_type))
+                if check_key not in _typechecked_expressions:
+                    expression.typecheck(expected_type)
+                    _typechecked_expressions[check_key] = expression
+
+            # Do the actual evaluation, unless we already know the value.
+            # Constant expressions take the same value in any environment, so
+            # they are evaluated once per process; other side-effect-free
+            # expressions are remembered per standard library against the
+            # exact bindings they were evaluated with.
+            if expression_is_constant(expression):
+                constant_hit = _constant_expression_values.get(id(expression))
+                if constant_hit is not None and constant_hit[0] is expression:
+                    value = constant_hit[1]
+                else:
+                    value = expression.eval(environment, stdlib)
+                    _constant_expression_values[id(expression)] = (expression, value)
+            elif isinstance(stdlib, ToilWDLStdLibBase) and expression_is_cacheable(expression):
+                eval_cache = stdlib._eval_cache
+                environment_values = [binding.value for binding in environment]
+                cache_key = (id(expression), tuple((binding.name, id(binding_value)) for binding, binding_value in zip(environment, environment_values)))
+                hit = eval_cache.get(cache_key)
+                if hit is not None:
+                    value = hit[1]
+                else:
+                    value = expression.eval(environment, stdlib)
+                    eval_cache[cache_key] = (environment_values, value)
+            else:
+                value = expression.eval(environment, stdlib)
         except Exception:
             # If something goes wrong, dump.
             logger.exception("Expression evaluation failed for %s: %s", name, expression)
@@ -606,9 +983,12 @@ def evaluate_defaultable_decl(node: WDL.Tree.Decl, environment: WDLBindings, std
     """
 
     try:
-        if node.name in environment and not isinstance(environment[node.name], WDL.Value.Null):
+        # Do one walk of the environment for the name instead of separate
+        # membership-test and lookup walks.
+        provided_value = environment.get(node.name)
+        if provided_value is not None and not isinstance(provided_value, WDL.Value.Null):
             logger.debug('Name %s is already defined with a non-null value, not using default', node.name)
-            return environment[node.name]
+            return provided_value
         else:
             if node.type is not None and not node.type.optional and node.expr is None:
                 # We need a value for this but there isn't one.
@@ -621,6 +1001,21 @@ def evaluate_defaultable_decl(node: WDL.Tree.Decl, environment: WDLBindings, std
         log_bindings(logger.exception, "Statement was evaluated in:", [environment])
         raise
 
+def add_defaultable_decl(node: WDL.Tree.Decl, environment: WDLBindings, stdlib: WDL.StdLib.Base) -> WDLBindings:
+    """
+    Return the environment with the declaration's value bound, evaluating its
+    default expression only if needed.
+
+    If a usable value is already bound, the environment is returned unchanged:
+    rebinding the same value would just add a shadow binding that every later
+    walk of the environment has to step over.
+    """
+
+    provided_value = environment.get(node.name)
+    if provided_value is not None and not isinstance(provided_value, WDL.Value.Null):
+        return environment
+    return environment.bind(node.name, evaluate_defaultable_decl(node, environment, stdlib))
+
 # TODO: make these stdlib methods???
 def devirtualize_files(environment: WDLBindings, stdlib: WDL.StdLib.Base) -> WDLBindings:
     """
@@ -800,6 +1195,11 @@ class WDLBaseJob(Job):
     Base job class for all WDL-related jobs.
     """
 
+    # The Job base still gives instances a __dict__, but slotting our own
+    # attributes in the subclasses skips the dict for the state we store on
+    # every one of the many jobs a workflow expands into.
+    __slots__ = ()
+
     def __init__(self, **kwargs: Any) -> None:
         """
         Make a WDL-related job.
@@ -839,6 +1239,8 @@ class WDLTaskJob(WDLBaseJob):
     All bindings are in terms of task-internal names.
     """
 
+    __slots__ = ('_task', '_prev_node_results', '_task_id', '_namespace')
+
     def __init__(self, task: WDL.Tree.Task, prev_node_results: Sequence[Promised[WDLBindings]], task_id: List[str], namespace: str, **kwargs: Any) -> None:
         """
         Make a new job to run a task.
@@ -849,7 +1251,7 @@ class WDLTaskJob(WDLBaseJob):
 
         super().__init__(unitName=namespace, displayName=namespace, **kwargs)
 
-        logger.info("Preparing to run task %s as %s", task.name, namespace)
+        logger.debug("Preparing to run task %s as %s", task.name, namespace)
 
         self._task = task
         self._prev_node_results = prev_node_results
@@ -887,16 +1289,16 @@ class WDLTaskJob(WDLBaseJob):
         # For a task we are only passed the inside-the-task namespace.
         bindings = combine_bindings(unwrap_all(self._prev_node_results))
         # Set up the WDL standard library
-        standard_library = ToilWDLStdLibBase(file_store)
+        standard_library = get_standard_library(file_store)
 
         if self._task.inputs:
             logger.debug("Evaluating task inputs")
             for input_decl in self._task.inputs:
                 # Evaluate all the inputs that aren't pre-set
-                bindings = bindings.bind(input_decl.name, evaluate_defaultable_decl(input_decl, bindings, standard_library))
+                bindings = add_defaultable_decl(input_decl, bindings, standard_library)
         for postinput_decl in self._task.postinputs:
             # Evaluate all the postinput decls
-            bindings = bindings.bind(postinput_decl.name, evaluate_defaultable_decl(postinput_decl, bindings, standard_library))
+            bindings = add_defaultable_decl(postinput_decl, bindings, standard_library)
 
         # Evaluate the runtime section
         runtime_bindings = evaluate_call_inputs(self._task, self._task.runtime, bindings, standard_library)
@@ -1215,6 +1617,8 @@ class WDLWorkflowNodeJob(WDLBaseJob):
     Job that evaluates a WDL workflow node.
     """
 
+    __slots__ = ('_node', '_prev_node_results', '_namespace')
+
     def __init__(self, node: WDL.Tree.WorkflowNode, prev_node_results: Sequence[Promised[WDLBindings]], namespace: str, **kwargs: Any) -> None:
         """
         Make a new job to run a workflow node to completion.
@@ -1238,7 +1642,7 @@ class WDLWorkflowNodeJob(WDLBaseJob):
         # Combine the bindings we get from previous jobs
         incoming_bindings = combine_bindings(unwrap_all(self._prev_node_results))
         # Set up the WDL standard library
-        standard_library = ToilWDLStdLibBase(file_store)
+        standard_library = get_standard_library(file_store)
 
         if isinstance(self._node, WDL.Tree.Decl):
             # This is a variable assignment
@@ -1257,7 +1661,18 @@ class WDLWorkflowNodeJob(WDLBaseJob):
             # TODO: this is letting us also inject them from the workflow body.
             # TODO: Can this result in picking up non-namespaced values that
             # aren't meant to be inputs, by not changing their names?
-            passed_down_bindings = incoming_bindings.enter_namespace(self._node.name)
+            #
+            # enter_namespace rebuilds the whole bindings chain just to
+            # prefix-filter it, and usually nothing is actually addressed to
+            # the call's namespace, so scan for the prefix first and skip the
+            # rebuild when it finds nothing. (A lazy namespace view isn't an
+            # option here because these bindings get pickled into the child
+            # job.)
+            namespace_prefix = self._node.name + '.'
+            if any(binding.name.startswith(namespace_prefix) for binding in incoming_bindings):
+                passed_down_bindings = incoming_bindings.enter_namespace(self._node.name)
+            else:
+                passed_down_bindings = WDL.Env.Bindings()
 
             if isinstance(self._node.callee, WDL.Tree.Workflow):
                 # This is a call of a workflow
@@ -1270,16 +1685,15 @@ class WDLWorkflowNodeJob(WDLBaseJob):
             else:
                 raise WDL.Error.InvalidType(self._node, "Cannot call a " + str(type(self._node.callee)))
 
-            # We need to agregate outputs namespaced with our node name, and existing bindings
-            namespace_job = WDLNamespaceBindingsJob(self._node.name, [subjob.rv()])
+            # We need to aggregate outputs namespaced with our node name, and
+            # existing bindings. The namespace job carries the incoming
+            # bindings along itself, so we don't need a separate combine job
+            # re-walking the result.
+            namespace_job = WDLNamespaceBindingsJob(self._node.name, [subjob.rv()], extra_bindings=incoming_bindings)
             subjob.addFollowOn(namespace_job)
             self.addChild(namespace_job)
 
-            combine_job = WDLCombineBindingsJob([namespace_job.rv(), incoming_bindings])
-            namespace_job.addFollowOn(combine_job)
-            self.addChild(combine_job)
-
-            return combine_job.rv()
+            return namespace_job.rv()
         elif isinstance(self._node, WDL.Tree.Scatter):
             subjob = WDLScatterJob(self._node, [incoming_bindings], self._namespace)
             self.addChild(subjob)
@@ -1295,12 +1709,61 @@ class WDLWorkflowNodeJob(WDLBaseJob):
         else:
             raise WDL.Error.InvalidType(self._node, "Unimplemented WorkflowNode: " + str(type(self._node)))
 
+class WDLWorkflowNodeListJob(WDLBaseJob):
+    """
+    Job that evaluates a linear chain of WDL value declarations in order.
+
+    A chain where each declaration is the only thing waiting on its
+    predecessor holds no parallelism, so running it as one job saves a Toil
+    job (and its serialization and scheduling round trips) per declaration.
+    """
+
+    __slots__ = ('_nodes', '_prev_node_results', '_namespace')
+
+    def __init__(self, nodes: List[WDL.Tree.WorkflowNode], prev_node_results: Sequence[Promised[WDLBindings]], namespace: str, **kwargs: Any) -> None:
+        """
+        Make a new job to run a chain of workflow nodes to completion.
+        """
+        super().__init__(unitName=nodes[0].workflow_node_id, displayName=nodes[0].workflow_node_id, **kwargs)
+
+        self._nodes = nodes
+        self._prev_node_results = prev_node_results
+        self._namespace = namespace
+
+        for node in self._nodes:
+            if not isinstance(node, WDL.Tree.Decl):
+                # Calls and sections schedule child jobs of their own, so they
+                # cannot be evaluated inline in a chain.
+                raise RuntimeError("Cannot chain a " + str(type(node)))
+
+    def run(self, file_store: AbstractFileStore) -> Promised[WDLBindings]:
+        """
+        Actually execute the chain of workflow nodes.
+        """
+        super().run(file_store)
+        logger.info("Running %s chained nodes starting with %s", len(self._nodes), self._nodes[0].workflow_node_id)
+
+        # Combine the bindings we get from previous jobs
+        incoming_bindings = combine_bindings(unwrap_all(self._prev_node_results))
+        # Set up the WDL standard library
+        standard_library = get_standard_library(file_store)
+
+        for node in self._nodes:
+            # Thread each declaration's value into the environment for the next
+            assert isinstance(node, WDL.Tree.Decl)
+            logger.info('Setting %s to %s', node.name, node.expr)
+            incoming_bindings = incoming_bindings.bind(node.name, evaluate_decl(node, incoming_bindings, standard_library))
+
+        return incoming_bindings
+
 class WDLCombineBindingsJob(WDLBaseJob):
     """
     Job that collects the results from WDL workflow nodes and combines their
     environment changes.
     """
 
+    __slots__ = ('_prev_node_results', '_underlay', '_remove')
+
     def __init__(self, prev_node_results: Sequence[Promised[WDLBindings]], underlay: Optional[Promised[WDLBindings]] = None, remove: Optional[Promised[WDLBindings]] = None, **kwargs: Any) -> None:
         """
         Make a new job to combine the results of previous jobs.
@@ -1334,27 +1797,40 @@ class WDLNamespaceBindingsJob(WDLBaseJob):
     Job that puts a set of bindings into a namespace.
     """
 
-    def __init__(self, namespace: str, prev_node_results: Sequence[Promised[WDLBindings]], **kwargs: Any) -> None:
+    __slots__ = ('_namespace', '_prev_node_results', '_extra_bindings')
+
+    def __init__(self, namespace: str, prev_node_results: Sequence[Promised[WDLBindings]], extra_bindings: Optional[Promised[WDLBindings]] = None, **kwargs: Any) -> None:
         """
         Make a new job to namespace results.
+
+        If extra_bindings is set, those bindings will be combined into the
+        result without being namespaced, so one job can both namespace a
+        call's outputs and carry the enclosing environment along.
         """
         super().__init__(**kwargs)
 
         self._namespace = namespace
         self._prev_node_results = prev_node_results
+        self._extra_bindings = extra_bindings
 
     def run(self, file_store: AbstractFileStore) -> WDLBindings:
         """
         Apply the namespace
         """
         super().run(file_store)
-        return combine_bindings(unwrap_all(self._prev_node_results)).wrap_namespace(self._namespace)
+        namespaced = combine_bindings(unwrap_all(self._prev_node_results)).wrap_namespace(self._namespace)
+        if self._extra_bindings is not None:
+            # Bring along the bindings that should stay un-namespaced.
+            namespaced = combine_bindings([namespaced, unwrap(self._extra_bindings)])
+        return namespaced
 
 class WDLSectionJob(WDLBaseJob):
     """
     Job that can create more graph for a section of the wrokflow.
     """
 
+    __slots__ = ('_namespace',)
+
     def __init__(self, namespace: str, **kwargs: Any) -> None:
         """
         Make a WDLSectionJob where the interior runs in the given namespace,
@@ -1381,65 +1857,24 @@ class WDLSectionJob(WDLBaseJob):
                at the end of the section.
         """
 
-        # We need to track the dependency universe; some of our child nodes may
-        # depend on nodes that are e.g. inputs to the workflow that encloses
-        # the section that encloses this section, and we need to just assume
-        # those are already available, even though we don't have access to the
-        # complete list. So we make a set of everything we actually do need to
-        # care about resolving, instead.
-        dependabes: Set[str] = set()
-
         if local_environment is not None:
             # Bring local environment into scope
             environment = combine_bindings([environment, local_environment])
 
-        # What nodes exist, under their IDs?
-        wdl_id_to_wdl_node: Dict[str, WDL.Tree.WorkflowNode] = {node.workflow_node_id: node for node in nodes if isinstance(node, WDL.Tree.WorkflowNode)}
-        dependabes |= set(wdl_id_to_wdl_node.keys())
-
-        # That doesn't include gather nodes, which in the Toil interpreter we
-        # handle as part of their enclosing section, without individual Toil
-        # jobs for each. So make a map from gather ID to the section node ID.
-        gather_to_section: Dict[str, str] = {}
-        for node in nodes:
-            if isinstance(node, WDL.Tree.WorkflowSection):
-                for gather_node in node.gathers.values():
-                    gather_to_section[gather_node.workflow_node_id] = node.workflow_node_id
-        dependabes |= set(gather_to_section.keys())
-
         # To make Toil jobs, we need all the jobs they depend on made so we can
         # call .rv(). So we need to solve the workflow DAG ourselves to set it up
-        # properly.
-
-        # We also need to make sure to bubble up dependencies from inside
-        # sections. A conditional might only appear to depend on the variables
-        # in the conditional expression, but its body can depend on other
-        # stuff, and we need to make sure that that stuff has finished and
-        # updated the environment before the conditional body runs. TODO: This
-        # is because Toil can't go and get and add successors to the relevant
-        # jobs later, while MiniWDL's engine apparently can. This ends up
-        # reducing parallelism more than would strictly be necessary; nothing
-        # in the conditional can start until the dependencies of everything in
-        # the conditional are ready.
-
-        # What are the dependencies of all the body nodes on other body nodes?
-        # Nodes can depend on other nodes actually in the tree, or on gathers
-        # that belong to other nodes, but we rewrite the gather dependencies
-        # through to the enclosing section node. Skip any dependencies on
-        # anything not provided by another body node (such as on an input, or
-        # something outside of the current section). TODO: This will need to
-        # change if we let parallelism transcend sections.
-        wdl_id_to_dependency_ids = {node_id: list({gather_to_section[dep] if dep in gather_to_section else dep for dep in recursive_dependencies(node) if dep in dependabes}) for node_id, node in wdl_id_to_wdl_node.items()}
-
-        # Which of those are outstanding?
-        wdl_id_to_outstanding_dependency_ids = copy.deepcopy(wdl_id_to_dependency_ids)
-
-        # What nodes depend on each node?
-        wdl_id_to_dependent_ids: Dict[str, Set[str]] = collections.defaultdict(set)
-        for node_id, dependencies in wdl_id_to_dependency_ids.items():
-            for dependency_id in dependencies:
-                # Invert the dependency edges
-                wdl_id_to_dependent_ids[dependency_id].add(node_id)
+        # properly. The solved DAG depends only on the WDL document, so it is
+        # computed once per section body and shared across instantiations
+        # (such as scatter iterations).
+        section_graph = plan_section_graph(nodes)
+        wdl_id_to_wdl_node = section_graph.wdl_id_to_wdl_node
+        wdl_id_to_dependency_ids = section_graph.wdl_id_to_dependency_ids
+        wdl_id_to_dependent_ids = section_graph.wdl_id_to_dependent_ids
+
+        # How many dependencies are outstanding for each node? We only need
+        # the counts to know when nodes become ready, so there's no call for
+        # deep-copying the whole dependency map just to consume it.
+        wdl_id_to_outstanding_count = {node_id: len(dependencies) for node_id, dependencies in wdl_id_to_dependency_ids.items()}
 
         # This will hold all the Toil jobs by WDL node ID
         wdl_id_to_toil_job: Dict[str, Job] = {}
@@ -1447,55 +1882,98 @@ class WDLSectionJob(WDLBaseJob):
         # And collect IDs of jobs with no successors to add a final sink job
         leaf_ids: Set[str] = set()
 
-        # What nodes are ready?
-        ready_node_ids = {node_id for node_id, dependencies in wdl_id_to_outstanding_dependency_ids.items() if len(dependencies) == 0}
-
-        while len(wdl_id_to_outstanding_dependency_ids) > 0:
-            logger.debug('Ready nodes: %s', ready_node_ids)
-            logger.debug('Waiting nodes: %s', wdl_id_to_outstanding_dependency_ids)
-
-            # Find a node that we can do now
-            node_id = next(iter(ready_node_ids))
-
-            # Say we are doing it
-            ready_node_ids.remove(node_id)
-            del wdl_id_to_outstanding_dependency_ids[node_id]
-            logger.debug('Make Toil job for %s', node_id)
-
-            # Collect the return values from previous jobs. Some nodes may have been inputs, without jobs.
-            prev_jobs = [wdl_id_to_toil_job[prev_node_id] for prev_node_id in wdl_id_to_dependency_ids[node_id] if prev_node_id in wdl_id_to_toil_job]
-            rvs: List[Union[WDLBindings, Promise]] = [prev_job.rv() for prev_job in prev_jobs]
-            # We also need access to section-level bindings like inputs
-            rvs.append(environment)
-
-            # Use them to make a new job
-            job = WDLWorkflowNodeJob(wdl_id_to_wdl_node[node_id], rvs, self._namespace)
-            for prev_job in prev_jobs:
-                # Connect up the happens-after relationships to make sure the
-                # return values are available.
-                # We have a graph that only needs one kind of happens-after
-                # relationship, so we always use follow-ons.
-                prev_job.addFollowOn(job)
-
-            if len(prev_jobs) == 0:
-                # Nothing came before this job, so connect it to the workflow.
-                self.addChild(job)
-
-            # Save the job
-            wdl_id_to_toil_job[node_id] = job
-
-            if len(wdl_id_to_dependent_ids[node_id]) == 0:
-                # Nothing comes after this job, so connect it to sink
-                leaf_ids.add(node_id)
-            else:
-                for dependent_id in wdl_id_to_dependent_ids[node_id]:
-                    # For each job that waits on this job
-                    wdl_id_to_outstanding_dependency_ids[dependent_id].remove(node_id)
-                    logger.debug('Dependent %s no longer needs to wait on %s', dependent_id, node_id)
-                    if len(wdl_id_to_outstanding_dependency_ids[dependent_id]) == 0:
-                        # We were the last thing blocking them.
-                        ready_node_ids.add(dependent_id)
-                        logger.debug('Dependent %s is now ready', dependent_id)
+        # What nodes are ready? The roots were found when the graph was
+        # planned. Use a deque so becoming ready is append and scheduling is
+        # popleft, with no per-node hashing, and so nodes are handled in the
+        # deterministic order in which they became ready.
+        ready_node_ids = collections.deque(section_graph.root_node_ids)
+
+        # Only stringify the scheduling state when somebody will actually see
+        # it; the ready and waiting collections can cover the whole section.
+        debug_logging = logger.isEnabledFor(logging.DEBUG)
+
+        while ready_node_ids:
+            if debug_logging:
+                logger.debug('Ready nodes: %s', ready_node_ids)
+                logger.debug('Waiting nodes: %s', wdl_id_to_outstanding_count)
+
+            # Everything that is ready right now forms a wave: by construction
+            # none of these nodes can depend on each other, so they can all be
+            # instantiated as sibling jobs before any of their dependents are
+            # considered.
+            current_wave = list(ready_node_ids)
+            ready_node_ids.clear()
+
+            for node_id in current_wave:
+                # Say we are doing it
+                del wdl_id_to_outstanding_count[node_id]
+                if debug_logging:
+                    logger.debug('Make Toil job for %s', node_id)
+
+                # Collect the return values from previous jobs. Some nodes may have been inputs, without jobs.
+                prev_jobs = [wdl_id_to_toil_job[prev_node_id] for prev_node_id in wdl_id_to_dependency_ids[node_id] if prev_node_id in wdl_id_to_toil_job]
+                rvs: List[Union[WDLBindings, Promise]] = [prev_job.rv() for prev_job in prev_jobs]
+                # We also need access to section-level bindings like inputs
+                rvs.append(environment)
+
+                # Use them to make a new job
+                job: WDLBaseJob
+                chain = section_graph.wdl_id_to_chain.get(node_id)
+                if chain is not None:
+                    # This node heads a chain of declarations that the planner
+                    # coalesced; run the whole chain as one job.
+                    job = WDLWorkflowNodeListJob([wdl_id_to_wdl_node[chain_id] for chain_id in chain], rvs, self._namespace)
+                else:
+                    job = WDLWorkflowNodeJob(wdl_id_to_wdl_node[node_id], rvs, self._namespace)
+                for prev_job in prev_jobs:
+                    # Connect up the happens-after relationships to make sure the
+                    # return values are available.
+                    # We have a graph that only needs one kind of happens-after
+                    # relationship, so we always use follow-ons.
+                    prev_job.addFollowOn(job)
+
+                if len(prev_jobs) == 0:
+                    # Nothing came before this job, so connect it to the workflow.
+                    self.addChild(job)
+
+                # Save the job. Chain members all resolve to the chain's job,
+                # so dependents that name the chain's tail still find it.
+                if chain is not None:
+                    for chain_id in chain:
+                        wdl_id_to_toil_job[chain_id] = job
+                else:
+                    wdl_id_to_toil_job[node_id] = job
+
+            for node_id in current_wave:
+                # Now that the whole wave exists, unblock its dependents so
+                # the next wave can be collected.
+                if len(wdl_id_to_dependent_ids[node_id]) == 0:
+                    # Nothing comes after this job, so connect it to sink
+                    leaf_ids.add(node_id)
+                else:
+                    for dependent_id in wdl_id_to_dependent_ids[node_id]:
+                        # For each job that waits on this job
+                        wdl_id_to_outstanding_count[dependent_id] -= 1
+                        if debug_logging:
+                            logger.debug('Dependent %s no longer needs to wait on %s', dependent_id, node_id)
+                        if wdl_id_to_outstanding_count[dependent_id] == 0:
+                            # We were the last thing blocking them.
+                            ready_node_ids.append(dependent_id)
+                            if debug_logging:
+                                logger.debug('Dependent %s is now ready', dependent_id)
+
+        if len(wdl_id_to_outstanding_count) > 0:
+            # The ready queue drained without reaching every node, which can
+            # only mean a dependency cycle. MiniWDL shouldn't let one
+            # typecheck, but don't silently run a partial section if it does.
+            raise RuntimeError('Dependency cycle in workflow section involving: ' + str(sorted(wdl_id_to_outstanding_count.keys())))
+
+        if len(leaf_ids) == 1 and not gather_nodes and local_environment is None:
+            # A single leaf already returns the aggregated environment (every
+            # node job passes its incoming bindings through), and with no
+            # gathers to underlay and nothing to remove from scope, a sink
+            # would just be an identity job. Hand back the leaf directly.
+            return wdl_id_to_toil_job[next(iter(leaf_ids))]
 
         # Make the sink job
         leaf_rvs: List[Union[WDLBindings, Promise]] = [wdl_id_to_toil_job[node_id].rv() for node_id in leaf_ids]
@@ -1566,6 +2044,14 @@ class WDLScatterJob(WDLSectionJob):
     instance of the body. If an instance of the body doesn't create a binding,
     it gets a null value in the corresponding array.
     """
+
+    __slots__ = ('_scatter', '_prev_node_results')
+    # How many scatter items should be expanded by one job? Scatters larger
+    # than this are split into chunk jobs, so the expansion itself can be
+    # spread across workers and no single job has to build one Toil job per
+    # item for an arbitrarily large scatter.
+    SCATTER_ITEMS_PER_JOB = 64
+
     def __init__(self, scatter: WDL.Tree.Scatter, prev_node_results: Sequence[Promised[WDLBindings]], namespace: str, **kwargs: Any) -> None:
         """
         Create a subtree that will run a WDL scatter. The scatter itself and the contents live in the given namespace.
@@ -1579,7 +2065,7 @@ class WDLScatterJob(WDLSectionJob):
         # at deserialization. So we need to do the actual building-out of the
         # workflow in run().
 
-        logger.info("Preparing to run scatter on %s", scatter.variable)
+        logger.debug("Preparing to run scatter on %s", scatter.variable)
 
         self._scatter = scatter
         self._prev_node_results = prev_node_results
@@ -1596,26 +2082,23 @@ class WDLScatterJob(WDLSectionJob):
         # For a task we only see the inside-the-task namespace.
         bindings = combine_bindings(unwrap_all(self._prev_node_results))
         # Set up the WDL standard library
-        standard_library = ToilWDLStdLibBase(file_store)
+        standard_library = get_standard_library(file_store)
 
         # Get what to scatter over
         scatter_value = evaluate_named_expression(self._scatter, self._scatter.variable, None, self._scatter.expr, bindings, standard_library)
 
         assert isinstance(scatter_value, WDL.Value.Array)
 
-        scatter_jobs = []
-        for item in scatter_value.value:
-            # Make an instantiation of our subgraph for each possible value of
-            # the variable. Make sure the variable is bound only for the
-            # duration of the body.
-            local_bindings: WDLBindings = WDL.Env.Bindings()
-            local_bindings = local_bindings.bind(self._scatter.variable, item)
-            # TODO: We need to turn values() into a list because MyPy seems to
-            # think a dict_values isn't a Sequence. This is a waste of time to
-            # appease MyPy but probably better than a cast?
-            scatter_jobs.append(self.create_subgraph(self._scatter.body, list(self._scatter.gathers.values()), bindings, local_bindings))
+        # The gather nodes are the same for every scatter item, so only fetch
+        # them once.
+        # TODO: We need to turn values() into a list because MyPy seems to
+        # think a dict_values isn't a Sequence. This is a waste of time to
+        # appease MyPy but probably better than a cast?
+        gather_nodes = list(self._scatter.gathers.values())
+
+        items = scatter_value.value
 
-        if len(scatter_jobs) == 0:
+        if len(items) == 0:
             # No scattering is needed. We just need to bind all the names.
 
             logger.info("No scattering is needed. Binding all scatter results to [].")
@@ -1624,9 +2107,32 @@ class WDLScatterJob(WDLSectionJob):
             # if nothing in the scatter actually runs. This should be some kind of
             # empty array.
             empty_array = WDL.Value.Array(WDL.Type.Any(optional=True, null=True), [])
-            return self.make_gather_bindings(list(self._scatter.gathers.values()), empty_array)
+            return self.make_gather_bindings(gather_nodes, empty_array)
+
+        if len(items) > self.SCATTER_ITEMS_PER_JOB:
+            # This scatter is big enough that expanding it all here would
+            # make one Toil job per item in a single pass. Delegate slices of
+            # the items to chunk jobs, each of which array-ifies its own
+            # slice, and concatenate the slices back together at the end.
+            chunk_jobs = []
+            for start in range(0, len(items), self.SCATTER_ITEMS_PER_JOB):
+                chunk_job = WDLScatterChunkJob(self._scatter, items[start:start + self.SCATTER_ITEMS_PER_JOB], [bindings], self._namespace)
+                self.addChild(chunk_job)
+                chunk_jobs.append(chunk_job)
+            concat_job = WDLConcatBindingsJob([chunk_job.rv() for chunk_job in chunk_jobs], bindings)
+            self.addChild(concat_job)
+            for chunk_job in chunk_jobs:
+                chunk_job.addFollowOn(concat_job)
+            return concat_job.rv()
 
-        # Otherwise we actually have some scatter jobs.
+        scatter_jobs = []
+        for item in items:
+            # Make an instantiation of our subgraph for each possible value of
+            # the variable. Make sure the variable is bound only for the
+            # duration of the body.
+            local_bindings: WDLBindings = WDL.Env.Bindings()
+            local_bindings = local_bindings.bind(self._scatter.variable, item)
+            scatter_jobs.append(self.create_subgraph(self._scatter.body, gather_nodes, bindings, local_bindings))
 
         # Make a job at the end to aggregate.
         # Turn all the bindings created inside the scatter bodies into arrays
@@ -1639,6 +2145,55 @@ class WDLScatterJob(WDLSectionJob):
             j.addFollowOn(gather_job)
         return gather_job.rv()
 
+class WDLScatterChunkJob(WDLSectionJob):
+    """
+    Job that expands a contiguous slice of a WDL scatter's items.
+
+    Returns the results for its slice already turned into arrays, the same
+    way the whole scatter's results would be, so slices can simply be
+    concatenated back together.
+    """
+
+    __slots__ = ('_scatter', '_items', '_prev_node_results')
+
+    def __init__(self, scatter: WDL.Tree.Scatter, items: Sequence[WDL.Value.Base], prev_node_results: Sequence[Promised[WDLBindings]], namespace: str, **kwargs: Any) -> None:
+        """
+        Create a subtree to run the scatter body over the given items.
+        """
+        super().__init__(namespace, **kwargs, unitName=scatter.workflow_node_id, displayName=scatter.workflow_node_id)
+
+        self._scatter = scatter
+        self._items = items
+        self._prev_node_results = prev_node_results
+
+    def run(self, file_store: AbstractFileStore) -> Promised[WDLBindings]:
+        """
+        Instantiate the scatter body for each item in the chunk.
+        """
+        super().run(file_store)
+
+        logger.info("Running scatter chunk of %s items on %s", len(self._items), self._scatter.variable)
+
+        # Combine the bindings we get from previous jobs.
+        bindings = combine_bindings(unwrap_all(self._prev_node_results))
+
+        gather_nodes = list(self._scatter.gathers.values())
+
+        scatter_jobs = []
+        for item in self._items:
+            # Make an instantiation of our subgraph for each item, with the
+            # variable bound only for the duration of the body.
+            local_bindings: WDLBindings = WDL.Env.Bindings()
+            local_bindings = local_bindings.bind(self._scatter.variable, item)
+            scatter_jobs.append(self.create_subgraph(self._scatter.body, gather_nodes, bindings, local_bindings))
+
+        # Array-ify this chunk's results just like a whole small scatter's.
+        gather_job = WDLArrayBindingsJob([j.rv() for j in scatter_jobs], bindings)
+        self.addChild(gather_job)
+        for j in scatter_jobs:
+            j.addFollowOn(gather_job)
+        return gather_job.rv()
+
 class WDLArrayBindingsJob(WDLBaseJob):
     """
     Job that takes all new bindings created in an array of input environments,
@@ -1649,6 +2204,8 @@ class WDLArrayBindingsJob(WDLBaseJob):
     Useful for producing the results of a scatter.
     """
 
+    __slots__ = ('_input_bindings', '_base_bindings')
+
     def __init__(self, input_bindings: Sequence[Promised[WDLBindings]], base_bindings: WDLBindings, **kwargs: Any) -> None:
         """
         Make a new job to array-ify the given input bindings.
@@ -1696,10 +2253,95 @@ class WDLArrayBindingsJob(WDLBaseJob):
         # Base bindings are already included so return the result
         return result
 
+class WDLConcatBindingsJob(WDLBaseJob):
+    """
+    Job that concatenates the array bindings produced by scatter chunks back
+    into single arrays, in chunk order.
+    """
+
+    __slots__ = ('_chunk_results', '_base_bindings')
+
+    def __init__(self, chunk_results: Sequence[Promised[WDLBindings]], base_bindings: WDLBindings, **kwargs: Any) -> None:
+        """
+        Make a new job to concatenate the given chunk results.
+
+        :param chunk_results: array-ified bindings from each chunk, in order.
+        :param base_bindings: bindings visible to all chunks, which should be
+               passed through unchanged rather than concatenated.
+        """
+        super().__init__(**kwargs)
+
+        self._chunk_results = chunk_results
+        self._base_bindings = base_bindings
+
+    def run(self, file_store: AbstractFileStore) -> WDLBindings:
+        """
+        Stitch the chunk arrays back together now that they are available.
+        """
+        super().run(file_store)
+
+        # Subtract base bindings to get just the arrays made in each chunk
+        chunk_bindings = [env.subtract(self._base_bindings) for env in unwrap_all(self._chunk_results)]
+
+        # Every chunk binds every gathered name (missing values become nulls
+        # in its arrays), so the names in each chunk are the same; collect
+        # them from wherever they first appear to be safe.
+        new_names: List[str] = []
+        for env in chunk_bindings:
+            for binding in env:
+                if binding.name not in new_names:
+                    new_names.append(binding.name)
+
+        # How many scatter items does each chunk cover? Every array a chunk
+        # binds has one slot per item, so measure any of them. We need the
+        # counts if a chunk is missing a name, so the concatenated arrays
+        # keep one aligned slot per item rather than silently shortening.
+        chunk_lengths: List[Optional[int]] = []
+        for env in chunk_bindings:
+            chunk_length: Optional[int] = None
+            for binding in env:
+                assert isinstance(binding.value, WDL.Value.Array)
+                chunk_length = len(binding.value.value)
+                break
+            chunk_lengths.append(chunk_length)
+
+        result = self._base_bindings
+        for name in new_names:
+            item_types: List[Optional[WDL.Type.Base]] = []
+            items: List[WDL.Value.Base] = []
+            for env, chunk_length in zip(chunk_bindings, chunk_lengths):
+                if not env.has_binding(name):
+                    # The gather-null underlay should make every chunk bind
+                    # every name, but if one slips through, pad its slots with
+                    # nulls like WDLArrayBindingsJob does per environment
+                    # instead of misaligning every later index.
+                    if chunk_length is None:
+                        # The chunk bound nothing at all, so we can't even
+                        # tell how many slots it covers.
+                        raise RuntimeError(f"Scatter chunk bound no value for {name} and its item count cannot be determined")
+                    if None not in item_types:
+                        item_types.append(None)
+                    items.extend(WDL.Value.Null() for _ in range(chunk_length))
+                    continue
+                chunk_array = env.resolve(name)
+                assert isinstance(chunk_array, WDL.Value.Array)
+                # The WDL type types are not hashable, so deduplicate by
+                # equality like WDLArrayBindingsJob does.
+                if chunk_array.type.item_type not in item_types:
+                    item_types.append(chunk_array.type.item_type)
+                items.extend(chunk_array.value)
+            # Bind the concatenated array under the supertype of the chunks'
+            # item types.
+            result = result.bind(name, WDL.Value.Array(get_supertype(item_types), items))
+
+        return result
+
 class WDLConditionalJob(WDLSectionJob):
     """
     Job that evaluates a conditional in a WDL workflow.
     """
+
+    __slots__ = ('_conditional', '_prev_node_results')
     def __init__(self, conditional: WDL.Tree.Conditional, prev_node_results: Sequence[Promised[WDLBindings]], namespace: str, **kwargs: Any) -> None:
         """
         Create a subtree that will run a WDL conditional. The conditional itself and its contents live in the given namespace.
@@ -1709,7 +2351,7 @@ class WDLConditionalJob(WDLSectionJob):
         # Once again we need to ship the whole body template to be instantiated
         # into Toil jobs only if it will actually run.
 
-        logger.info("Preparing to run conditional on %s", conditional.expr)
+        logger.debug("Preparing to run conditional on %s", conditional.expr)
 
         self._conditional = conditional
         self._prev_node_results = prev_node_results
@@ -1726,7 +2368,7 @@ class WDLConditionalJob(WDLSectionJob):
         # For a task we only see the insode-the-task namespace.
         bindings = combine_bindings(unwrap_all(self._prev_node_results))
         # Set up the WDL standard library
-        standard_library = ToilWDLStdLibBase(file_store)
+        standard_library = get_standard_library(file_store)
 
         # Get the expression value. Fake a name.
         expr_value = evaluate_named_expression(self._conditional, "<conditional expression>", WDL.Type.Boolean(), self._conditional.expr, bindings, standard_library)
@@ -1749,6 +2391,8 @@ class WDLWorkflowJob(WDLSectionJob):
     Job that evaluates an entire WDL workflow.
     """
 
+    __slots__ = ('_workflow', '_prev_node_results', '_workflow_id')
+
     def __init__(self, workflow: WDL.Tree.Workflow, prev_node_results: Sequence[Promised[WDLBindings]], workflow_id: List[str], namespace: str, **kwargs: Any) -> None:
         """
         Create a subtree that will run a WDL workflow. The job returns the
@@ -1786,12 +2430,12 @@ class WDLWorkflowJob(WDLSectionJob):
         # For a task we only see the insode-the-task namespace.
         bindings = combine_bindings(unwrap_all(self._prev_node_results))
         # Set up the WDL standard library
-        standard_library = ToilWDLStdLibBase(file_store)
+        standard_library = get_standard_library(file_store)
 
         if self._workflow.inputs:
             for input_decl in self._workflow.inputs:
                 # Evaluate all the inputs that aren't pre-set
-                bindings = bindings.bind(input_decl.name, evaluate_defaultable_decl(input_decl, bindings, standard_library))
+                bindings = add_defaultable_decl(input_decl, bindings, standard_library)
 
         # Make jobs to run all the parts of the workflow
         sink = self.create_subgraph(self._workflow.body, [], bindings)
@@ -1813,6 +2457,8 @@ class WDLOutputsJob(WDLBaseJob):
     Returns an environment with just the outputs bound, in no namespace.
     """
 
+    __slots__ = ('_outputs', '_bindings')
+
     def __init__(self, outputs: List[WDL.Tree.Decl], bindings: Promised[WDLBindings], **kwargs: Any):
         """
         Make a new WDLWorkflowOutputsJob for the given workflow, with the given set of bindings after its body runs.
@@ -1829,7 +2475,7 @@ class WDLOutputsJob(WDLBaseJob):
         super().run(file_store)
 
         # Evaluate all the outputs in the noirmal, non-task-outputs library context
-        standard_library = ToilWDLStdLibBase(file_store)
+        standard_library = get_standard_library(file_store)
         output_bindings: WDL.Env.Bindings[WDL.Value.Base] = WDL.Env.Bindings()
         for output_decl in self._outputs:
             output_bindings = output_bindings.bind(output_decl.name, evaluate_decl(output_decl, unwrap(self._bindings), standard_library))
@@ -1843,6 +2489,8 @@ class WDLRootJob(WDLSectionJob):
     the workflow name; both forms are accepted.
     """
 
+    __slots__ = ('_workflow', '_inputs')
+
     def __init__(self, workflow: WDL.Tree.Workflow, inputs: WDLBindings, **kwargs: Any) -> None:
         """
         Create a subtree to run the workflow and namespace the outputs.
@@ -1871,6 +2519,17 @@ class WDLRootJob(WDLSectionJob):
 
         return namespace_job.rv()
 
+@functools.lru_cache(maxsize=8)
+def load_wdl_document(uri: str, mtime: float) -> WDL.Tree.Document:
+    """
+    Load, parse, and typecheck the WDL document at the given URI.
+
+    Documents are cached per process, keyed on the URI and, for local files,
+    the modification time, so repeated loads of an unchanged document reuse
+    the checked tree.
+    """
+    return WDL.load(uri, read_source=toil_read_source)
+
 def main() -> None:
     """
     A Toil workflow to interpret WDL input files.
@@ -1915,7 +2574,8 @@ def main() -> None:
             output_bindings = toil.restart()
         else:
             # Load the WDL document
-            document: WDL.Tree.Document = WDL.load(options.wdl_uri, read_source=toil_read_source)
+            wdl_mtime = os.path.getmtime(options.wdl_uri) if os.path.isfile(options.wdl_uri) else 0.0
+            document: WDL.Tree.Document = load_wdl_document(options.wdl_uri, wdl_mtime)
 
             if document.workflow is None:
                 logger.critical("No workflow in document!")
@@ -1926,8 +2586,9 @@ def main() -> None:
                 # have to break into async temporarily.
                 downloaded = asyncio.run(toil_read_source(options.inputs_uri, [], None))
                 try:
-                    inputs = json.loads(downloaded.source_text)
-                except json.JSONDecodeError as e:
+                    inputs = json_loads(downloaded.source_text)
+                except ValueError as e:
+                    # Both the stdlib and orjson decode errors are ValueErrors
                     logger.critical('Cannot parse JSON at %s: %s', downloaded.abspath, e)
                     sys.exit(1)
             else: